@@ -1,16 +1,62 @@
 import Foundation
 import Darwin
 import FluidAudio
+import os
 
 // Keep a duplicate of the real protocol stdout so progress events still reach
 // Tauri while native library calls temporarily redirect STDOUT_FILENO.
 
 let protocolStdoutFileDescriptor = dup(STDOUT_FILENO)
 
-func writeProtocolLine(_ line: String) {
+// Responses with no dynamic fields are serialized once, newline included.
+let ctcModelsOkLine = Data(#"{"type":"ok","command":"download_ctc_models"}\#n"#.utf8)
+let serializationErrorLine = Data(#"{"type":"error","code":"serialization_error","message":"Failed to serialize response"}\#n"#.utf8)
+let invalidPayloadErrorLine = Data(#"{"type":"error","code":"invalid_payload","message":"Command payload must be a JSON object"}\#n"#.utf8)
+let invalidModelVersionErrorLine = Data(#"{"type":"error","code":"invalid_model_version","message":"model_version must be \"v2\" or \"v3\""}\#n"#.utf8)
+let missingAudioPathErrorLine = Data(#"{"type":"error","code":"missing_audio_path","message":"audio_path is required"}\#n"#.utf8)
+let unknownCommandErrorLine = Data(#"{"type":"error","code":"unknown_command","message":"Unknown command type"}\#n"#.utf8)
+
+// FluidAudio reports download progress per received chunk, far more often than
+// the host can show a change. Repeats of the same whole percent and phase are
+// dropped instead of each costing a write(2) and a host-side event.
+struct ProgressKey: Equatable, Sendable {
+    let percent: Int
+    let phase: String
+}
+
+let lastSentProgress = OSAllocatedUnfairLock<ProgressKey?>(initialState: nil)
+
+// writev sends the encoder's buffer and the trailing newline in one syscall,
+// so the payload is never copied just to append a byte.
+func writeProtocolLine(_ payload: Data) {
+    let outputFileDescriptor = protocolStdoutFileDescriptor >= 0 ? protocolStdoutFileDescriptor : STDOUT_FILENO
+    var newline: UInt8 = 0x0A
+
+    let written = payload.withUnsafeBytes { (buffer: UnsafeRawBufferPointer) -> Int in
+        withUnsafeMutableBytes(of: &newline) { newlineBuffer -> Int in
+            let vectors = [
+                iovec(iov_base: UnsafeMutableRawPointer(mutating: buffer.baseAddress), iov_len: buffer.count),
+                iovec(iov_base: newlineBuffer.baseAddress, iov_len: 1),
+            ]
+            return writev(outputFileDescriptor, vectors, 2)
+        }
+    }
+
+    guard written >= 0 else {
+        return
+    }
+
+    // Short writes finish through the plain write loop.
+    if written < payload.count {
+        writeProtocolBytes(payload.dropFirst(written))
+        writeProtocolBytes(Data([0x0A]))
+    } else if written == payload.count {
+        writeProtocolBytes(Data([0x0A]))
+    }
+}
+
+func writeProtocolBytes(_ data: Data) {
     let outputFileDescriptor = protocolStdoutFileDescriptor >= 0 ? protocolStdoutFileDescriptor : STDOUT_FILENO
-    var data = Data(line.utf8)
-    data.append(0x0A)
 
     data.withUnsafeBytes { buffer in
         guard let baseAddress = buffer.baseAddress else {
@@ -32,10 +78,65 @@ func writeProtocolLine(_ line: String) {
     }
 }
 
-// Helper function to log to stderr (so it doesn't interfere with JSON on stdout)
+// Reads stdin in large chunks and splits out newline-delimited commands, so a
+// burst of commands from the host costs one read(2) instead of a buffered
+// getline plus String round-trip per line.
+struct StdinLineReader {
+    private var buffer: [UInt8] = []
+    private var start = 0
+    private var chunk = [UInt8](repeating: 0, count: 64 * 1024)
+    private var reachedEOF = false
+
+    mutating func nextLine() -> Data? {
+        while true {
+            if let newline = buffer[start...].firstIndex(of: 0x0A) {
+                let line = Data(buffer[start..<newline])
+                start = newline + 1
+                return line
+            }
+
+            if start > 0 {
+                buffer.removeFirst(start)
+                start = 0
+            }
+
+            if reachedEOF {
+                guard !buffer.isEmpty else { return nil }
+                let line = Data(buffer)
+                buffer.removeAll()
+                return line
+            }
+
+            let count = chunk.withUnsafeMutableBytes { bytes in
+                Darwin.read(STDIN_FILENO, bytes.baseAddress, bytes.count)
+            }
+            if count > 0 {
+                buffer.append(contentsOf: chunk[0..<count])
+            } else if count < 0 && errno == EINTR {
+                continue
+            } else {
+                reachedEOF = true
+            }
+        }
+    }
+}
+
+// Helper function to log to stderr (so it doesn't interfere with JSON on stdout).
+// stderr is unbuffered, so no explicit flush is needed.
 func log(_ message: String) {
     fputs("\(message)\n", stderr)
-    fflush(stderr)
+}
+
+// The host re-logs every stderr line at info level, so decorative separators
+// and the cache directory listing stay off unless PARAKEET_SIDECAR_DEBUG is set.
+// Step markers stay on `log`: the last one printed is the stall context in
+// field logs. The message is an autoclosure so disabled calls skip the string
+// interpolation too.
+let debugLoggingEnabled = ProcessInfo.processInfo.environment["PARAKEET_SIDECAR_DEBUG"] != nil
+
+func debugLog(_ message: @autoclosure () -> String) {
+    guard debugLoggingEnabled else { return }
+    log(message())
 }
 
 // Get system architecture info
@@ -83,7 +184,7 @@ func logSystemInfo() {
 }
 
 
-struct IncomingVocabularyTerm: Decodable {
+struct IncomingVocabularyTerm: Decodable, Equatable {
     let text: String
     let aliases: [String]
 
@@ -98,22 +199,79 @@ struct IncomingVocabularyTerm: Decodable {
     }
 }
 
-struct OkResponse: Encodable {
-    let type: String = "ok"
-    let command: String
+// Unrecognised `type` strings decode as nil and are answered with unknown_command.
+enum CommandType: String, Decodable {
+    case loadModel = "load_model"
+    case downloadModel = "download_model"
+    case unloadModel = "unload_model"
+    case deleteModel = "delete_model"
+    case transcribe
+    case downloadCtcModels = "download_ctc_models"
+    case diarize
+    case status
+    case shutdown
 }
 
-// JSON message structures for communication with Tauri
+// Every command shares one flat shape: fields a command type doesn't use decode
+// as nil. Optional fields are read leniently (a wrong JSON type becomes nil) so
+// a single JSONDecoder pass behaves like the old dictionary lookups.
+struct IncomingCommand: Decodable {
+    let type: CommandType?
+    let modelVersion: SupportedModelVersion?
+    let forceDownload: Bool?
+    let audioPath: String?
+    let language: String?
+    let translateToEnglish: Bool?
+    let customVocabulary: [IncomingVocabularyTerm]
+
+    private enum CodingKeys: String, CodingKey {
+        case type
+        case modelVersion = "model_version"
+        case forceDownload = "force_download"
+        case audioPath = "audio_path"
+        case language
+        case translateToEnglish = "translate_to_english"
+        case customVocabulary = "custom_vocabulary"
+    }
+
+    init(from decoder: Decoder) throws {
+        let container = try decoder.container(keyedBy: CodingKeys.self)
+        type = try? container.decode(CommandType.self, forKey: .type)
+        // model_version is mapped onto SupportedModelVersion (case-insensitively)
+        // and an empty audio_path is normalised away here, so both arrive as nil
+        // and the dispatcher only has to check for a missing value.
+        modelVersion = (try? container.decode(String.self, forKey: .modelVersion))
+            .flatMap { SupportedModelVersion(rawValue: $0.lowercased()) }
+        forceDownload = try? container.decode(Bool.self, forKey: .forceDownload)
+        audioPath = (try? container.decode(String.self, forKey: .audioPath))
+            .flatMap { $0.isEmpty ? nil : $0 }
+        language = try? container.decode(String.self, forKey: .language)
+        translateToEnglish = try? container.decode(Bool.self, forKey: .translateToEnglish)
+
+        if container.contains(.customVocabulary) {
+            do {
+                customVocabulary = try container.decodeIfPresent([IncomingVocabularyTerm].self, forKey: .customVocabulary) ?? []
+            } catch {
+                log("⚠️ Custom vocabulary ignored: command vocabulary payload could not be decoded")
+                customVocabulary = []
+            }
+        } else {
+            customVocabulary = []
+        }
+    }
+}
+
+// JSON message structures for communication with Tauri.
+// FluidAudio returns no per-segment timings, so `segments` is omitted rather
+// than encoded as an always-empty array; Rust defaults it to `[]`.
 struct TranscriptionResponse: Encodable {
     let type: String = "transcription"
     let text: String
-    let segments: [Segment]
     let language: String?
     let duration: Float?
 
-    init(text: String, segments: [Segment] = [], language: String? = nil, duration: Float? = nil) {
+    init(text: String, language: String? = nil, duration: Float? = nil) {
         self.text = text
-        self.segments = segments
         self.language = language
         self.duration = duration
     }
@@ -130,10 +288,6 @@ struct SpeakerSegment: Encodable {
     let end: Float
 }
 
-struct Segment: Encodable {
-    let text: String
-}
-
 struct StatusResponse: Encodable {
     let type: String = "status"
     let loadedModel: String?
@@ -151,13 +305,6 @@ struct ProgressResponse: Encodable {
     let phase: String
 }
 
-struct ErrorResponse: Encodable {
-    let type: String = "error"
-    let code: String
-    let message: String
-    let details: [String: String]? = nil  // Optional details field to match Rust
-}
-
 enum SupportedModelVersion: String, CaseIterable {
     case v2
     case v3
@@ -182,18 +329,26 @@ enum SupportedModelVersion: String, CaseIterable {
 }
 
 // Global ASR manager state
-@MainActor var asrManager: AsrManager?
-@MainActor var isModelLoaded = false
+// `loadedEngine` is the single source of truth for "a model is loaded"; readers
+// take one snapshot of it instead of consulting a separate flag. The decoder
+// layer count is fixed by the loaded model, so it is read once at load and kept
+// alongside the manager rather than fetched from the AsrManager actor per
+// transcribe.
+@MainActor var loadedEngine: (manager: AsrManager, decoderLayers: Int)?
 @MainActor var loadedModelVersion: SupportedModelVersion?
 @MainActor var downloadedVersions = Set<SupportedModelVersion>()
 @MainActor var cachedCtcModels: CtcModels?
 @MainActor var cachedCtcTokenizer: CtcTokenizer?
+// Tokenized vocabulary for the most recent request; the host sends the same
+// list on every transcribe, so it only needs re-encoding when the list changes.
+@MainActor var cachedVocabularyContext: (terms: [IncomingVocabularyTerm], context: CustomVocabularyContext)?
+
+let ctcModelDirectory = CtcModels.defaultCacheDirectory(for: .ctc110m)
+let ctcTokenizerPath = ctcModelDirectory.appendingPathComponent("tokenizer.json").path
 
 func ctcVocabularyReady() -> Bool {
-    let directory = CtcModels.defaultCacheDirectory(for: .ctc110m)
-    let tokenizerURL = directory.appendingPathComponent("tokenizer.json")
-    return CtcModels.modelsExist(at: directory)
-        && FileManager.default.fileExists(atPath: tokenizerURL.path)
+    return CtcModels.modelsExist(at: ctcModelDirectory)
+        && FileManager.default.fileExists(atPath: ctcTokenizerPath)
 }
 @MainActor var cachedCtcSpotter: CtcKeywordSpotter?
 @MainActor
@@ -220,118 +375,103 @@ struct ParakeetSidecar {
     }
 
     static func runEventLoop(encoder: JSONEncoder) async {
-        while let line = readLine() {
-            let trimmed = line.trimmingCharacters(in: .whitespacesAndNewlines)
-            guard !trimmed.isEmpty else { continue }
+        let decoder = JSONDecoder()
+        var reader = StdinLineReader()
 
+        while let line = reader.nextLine() {
+            guard line.contains(where: { $0 != 0x20 && $0 != 0x09 && $0 != 0x0D }) else { continue }
+
+            let command: IncomingCommand
             do {
-                guard let data = trimmed.data(using: .utf8) else {
-                    sendError("invalid_encoding", message: "Failed to parse command payload", encoder: encoder)
-                    continue
-                }
+                command = try decoder.decode(IncomingCommand.self, from: line)
+            } catch DecodingError.typeMismatch, DecodingError.valueNotFound {
+                // Valid JSON that isn't an object, including bare scalars such
+                // as `null`, `5` or `"x"`
+                writeProtocolBytes(invalidPayloadErrorLine)
+                continue
+            } catch {
+                sendError("parse_error", message: "Failed to parse JSON: \(error)", encoder: encoder)
+                continue
+            }
 
-                guard let json = try JSONSerialization.jsonObject(with: data) as? [String: Any] else {
-                    sendError("invalid_payload", message: "Command payload must be a JSON object", encoder: encoder)
+            switch command.type {
+            case .loadModel, .downloadModel:
+                guard let version = command.modelVersion else {
+                    writeProtocolBytes(invalidModelVersionErrorLine)
                     continue
                 }
+                let forceDownload = command.forceDownload ?? (command.type == .downloadModel)
+                await loadModel(version: version, forceDownload: forceDownload, encoder: encoder)
 
-                switch json["type"] as? String {
-                case "load_model", "download_model":
-                    guard let version = parseModelVersion(json["model_version"]) else {
-                        sendError("invalid_model_version", message: "model_version must be \"v2\" or \"v3\"", encoder: encoder)
-                        continue
-                    }
-                    let forceDownload: Bool
-                    if let explicit = json["force_download"] as? Bool {
-                        forceDownload = explicit
-                    } else {
-                        forceDownload = (json["type"] as? String) == "download_model"
-                    }
-                    await loadModel(version: version, forceDownload: forceDownload, encoder: encoder)
+            case .unloadModel:
+                await unloadModel()
+                sendResponse(StatusResponse(loadedModel: nil, modelVersion: nil), encoder: encoder)
 
-                case "unload_model":
+            case .deleteModel:
+                guard let version = command.modelVersion else {
+                    writeProtocolBytes(invalidModelVersionErrorLine)
+                    continue
+                }
+                deleteModelFiles(for: version)
+                if loadedModelVersion == version {
                     await unloadModel()
-                    sendResponse(StatusResponse(loadedModel: nil, modelVersion: nil), encoder: encoder)
-
-                case "delete_model":
-                    guard let version = parseModelVersion(json["model_version"]) else {
-                        sendError("invalid_model_version", message: "model_version must be \"v2\" or \"v3\"", encoder: encoder)
-                        continue
-                    }
-                    deleteModelFiles(for: version)
-                    if loadedModelVersion == version {
-                        await unloadModel()
-                    }
-                    sendResponse(StatusResponse(loadedModel: loadedModelVersion?.modelIdentifier, modelVersion: loadedModelVersion?.rawValue), encoder: encoder)
-
-                case "transcribe":
-                    if let audioPath = json["audio_path"] as? String {
-                        // Extract optional parameters from Rust backend
-                        let language = json["language"] as? String
-                        let translateToEnglish = json["translate_to_english"] as? Bool ?? false
-                        let customVocabulary = decodeCustomVocabulary(from: data)
-                        await transcribeFile(audioPath, language: language, translateToEnglish: translateToEnglish, customVocabulary: customVocabulary, encoder: encoder)
-                    } else {
-                        sendError("missing_audio_path", message: "audio_path is required", encoder: encoder)
-                    }
+                }
+                sendResponse(StatusResponse(loadedModel: loadedModelVersion?.modelIdentifier, modelVersion: loadedModelVersion?.rawValue), encoder: encoder)
+
+            case .transcribe:
+                if let audioPath = command.audioPath {
+                    await transcribeFile(
+                        audioPath,
+                        language: command.language,
+                        translateToEnglish: command.translateToEnglish ?? false,
+                        customVocabulary: command.customVocabulary,
+                        encoder: encoder
+                    )
+                } else {
+                    writeProtocolBytes(missingAudioPathErrorLine)
+                }
 
 
-                case "download_ctc_models":
-                    await downloadCtcModels(encoder: encoder)
+            case .downloadCtcModels:
+                await downloadCtcModels(encoder: encoder)
 
-                case "diarize":
-                    if let audioPath = json["audio_path"] as? String {
-                        await diarizeFile(audioPath, encoder: encoder)
-                    } else {
-                        sendError("missing_audio_path", message: "audio_path is required", encoder: encoder)
-                    }
+            case .diarize:
+                if let audioPath = command.audioPath {
+                    await diarizeFile(audioPath, encoder: encoder)
+                } else {
+                    writeProtocolBytes(missingAudioPathErrorLine)
+                }
 
-                case "status":
-                    sendResponse(
-                        StatusResponse(
-                            loadedModel: loadedModelVersion?.modelIdentifier,
-                            modelVersion: loadedModelVersion?.rawValue
-                        ),
-                        encoder: encoder
-                    )
+            case .status:
+                sendResponse(
+                    StatusResponse(
+                        loadedModel: loadedModelVersion?.modelIdentifier,
+                        modelVersion: loadedModelVersion?.rawValue
+                    ),
+                    encoder: encoder
+                )
 
-                case "shutdown":
-                    await unloadModel()
-                    exit(0)
+            case .shutdown:
+                await unloadModel()
+                exit(0)
 
-                default:
-                    sendError("unknown_command", message: "Unknown command type", encoder: encoder)
-                }
-            } catch {
-                sendError("parse_error", message: "Failed to parse JSON: \(error)", encoder: encoder)
+            case nil:
+                writeProtocolBytes(unknownCommandErrorLine)
             }
         }
     }
 
     static func loadModel(version: SupportedModelVersion = .v3, forceDownload: Bool = false, emitStatus: Bool = true, encoder: JSONEncoder) async {
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("🔄 LOAD MODEL REQUEST")
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("📦 Requested version: \(version.rawValue.uppercased()) (\(version.modelIdentifier))")
         log("📁 Repo folder: \(version.repoFolderName)")
         log("🔄 Force download: \(forceDownload)")
         log("📐 Running on: \(getArchitectureInfo())")
 
-        // Check expected cache path
-        let home = FileManager.default.homeDirectoryForCurrentUser
-        let expectedPath = home
-            .appendingPathComponent("Library/Application Support/FluidAudio/Models")
-            .appendingPathComponent(version.repoFolderName)
-        log("📍 Expected cache path: \(expectedPath.path)")
-        log("📂 Path exists: \(FileManager.default.fileExists(atPath: expectedPath.path))")
-
-        if FileManager.default.fileExists(atPath: expectedPath.path) {
-            if let contents = try? FileManager.default.contentsOfDirectory(atPath: expectedPath.path) {
-                log("📄 Cache contents: \(contents.joined(separator: ", "))")
-            }
-        }
-
-        if isModelLoaded, !forceDownload, let loadedVersion = loadedModelVersion, loadedVersion == version {
+        // Reuse check first: it needs no paths and no filesystem access.
+        if loadedEngine != nil, !forceDownload, let loadedVersion = loadedModelVersion, loadedVersion == version {
             log("⚡ Model already loaded: \(loadedVersion.modelIdentifier)")
             if emitStatus {
                 sendResponse(StatusResponse(loadedModel: loadedVersion.modelIdentifier, modelVersion: loadedVersion.rawValue), encoder: encoder)
@@ -339,6 +479,28 @@ struct ParakeetSidecar {
             return
         }
 
+        // Check expected cache path (diagnostics only, so skipped entirely
+        // unless debug logging is on)
+        if debugLoggingEnabled {
+            let home = FileManager.default.homeDirectoryForCurrentUser
+            let expectedPath = home
+                .appendingPathComponent("Library/Application Support/FluidAudio/Models")
+                .appendingPathComponent(version.repoFolderName)
+            let expectedPathExists = FileManager.default.fileExists(atPath: expectedPath.path)
+            log("📍 Expected cache path: \(expectedPath.path)")
+            log("📂 Path exists: \(expectedPathExists)")
+
+            if expectedPathExists {
+                if let contents = try? FileManager.default.contentsOfDirectory(atPath: expectedPath.path) {
+                    log("📄 Cache contents: \(contents.joined(separator: ", "))")
+                }
+            }
+        }
+
+        // Progress de-duplication is per command; a previous load's last event
+        // must not swallow this one's first.
+        lastSentProgress.withLock { $0 = nil }
+
         do {
             let models: AsrModels
             let progressHandler: DownloadUtils.ProgressHandler = { progress in
@@ -388,9 +550,8 @@ struct ParakeetSidecar {
                 try await manager.loadModels(models)
             }
             log("✅ AsrManager initialized successfully")
-            asrManager = manager
-
-            isModelLoaded = true
+            let decoderLayers = await manager.decoderLayerCount
+            loadedEngine = (manager: manager, decoderLayers: decoderLayers)
             loadedModelVersion = version
             log("✅ Model load complete: \(version.modelIdentifier)")
             if emitStatus {
@@ -403,14 +564,16 @@ struct ParakeetSidecar {
             log("❌ Localized: \(error.localizedDescription)")
             sendError("model_load_error", message: "Failed to load model: \(error.localizedDescription)", encoder: encoder)
         }
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
     }
 
     static func unloadModel() async {
-        await asrManager?.cleanup()
-        asrManager = nil
-        isModelLoaded = false
+        // Clear the published state before suspending on cleanup so nothing
+        // observes a half-torn-down manager across the await.
+        let engine = loadedEngine
+        loadedEngine = nil
         loadedModelVersion = nil
+        await engine?.manager.cleanup()
     }
 
     static func deleteModelFiles(for version: SupportedModelVersion) {
@@ -444,9 +607,9 @@ struct ParakeetSidecar {
     }
 
     static func transcribeFile(_ audioPath: String, language: String? = nil, translateToEnglish: Bool = false, customVocabulary: [IncomingVocabularyTerm] = [], encoder: JSONEncoder) async {
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("🎤 TRANSCRIBE REQUEST")
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("📄 Audio path: \(audioPath)")
         log("🌐 Language: \(language ?? "auto-detect")")
         log("🔄 Translate to English: \(translateToEnglish)")
@@ -454,39 +617,23 @@ struct ParakeetSidecar {
         log("📐 Running on: \(getArchitectureInfo())")
 
         // Check if model is loaded - DO NOT auto-download
-        guard isModelLoaded else {
+        guard let engine = loadedEngine else {
             log("❌ No model loaded!")
             sendError("model_not_loaded", message: "Parakeet model not loaded. Please download it first from Settings.", encoder: encoder)
             return
         }
 
-        let fileURL = URL(fileURLWithPath: audioPath)
-
-        // Check if file exists
-        guard FileManager.default.fileExists(atPath: audioPath) else {
-            log("❌ Audio file not found: \(audioPath)")
-            sendError("file_not_found", message: "Audio file not found: \(audioPath)", encoder: encoder)
-            return
-        }
-
-        // Log file info
-        if let attrs = try? FileManager.default.attributesOfItem(atPath: audioPath) {
-            let size = attrs[.size] as? Int64 ?? 0
-            log("📊 File size: \(size) bytes (\(size / 1024) KB)")
-        }
-
-        guard let manager = asrManager else {
-            log("❌ AsrManager is nil even though isModelLoaded=true!")
-            sendError("model_not_loaded", message: "Parakeet engine is not initialized", encoder: encoder)
-            return
-        }
+        // Passing isDirectory up front stops Foundation from stat'ing the path
+        // to find out; the host only ever sends audio files.
+        let fileURL = URL(fileURLWithPath: audioPath, isDirectory: false)
 
         do {
             log("🎙️ Starting transcription...")
             let startTime = Date()
 
             // Transcribe the audio file (returns ASRResult)
-            var decoderState = TdtDecoderState.make(decoderLayers: await manager.decoderLayerCount)
+            let manager = engine.manager
+            var decoderState = TdtDecoderState.make(decoderLayers: engine.decoderLayers)
             let result = try await withLibraryStdoutRedirected {
                 try await manager.transcribe(fileURL, decoderState: &decoderState)
             }
@@ -505,12 +652,19 @@ struct ParakeetSidecar {
             // Send transcription response
             let response = TranscriptionResponse(
                 text: finalText,
-                segments: [],
                 language: language,
                 duration: Float(result.duration)
             )
             sendResponse(response, encoder: encoder)
         } catch {
+            // The model opens the file itself, so a missing file is only
+            // diagnosed here rather than stat'ed up front on every request.
+            guard FileManager.default.fileExists(atPath: audioPath) else {
+                log("❌ Audio file not found: \(audioPath)")
+                sendError("file_not_found", message: "Audio file not found: \(audioPath)", encoder: encoder)
+                debugLog("───────────────────────────────────────────────────────")
+                return
+            }
             log("❌ TRANSCRIPTION FAILED")
             log("❌ Error type: \(type(of: error))")
             log("❌ Error details: \(error)")
@@ -518,14 +672,24 @@ struct ParakeetSidecar {
             // Send error response instead of transcription with error
             sendError("transcription_failed", message: "Transcription failed: \(error.localizedDescription)", encoder: encoder)
         }
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
     }
 
 
     static func downloadCtcModels(encoder: JSONEncoder) async {
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("📥 DOWNLOAD CTC MODELS REQUEST")
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
+
+        // FluidAudio's download always lists the remote repo first; when every
+        // file is already on disk there is nothing to fetch, so answer locally.
+        if ctcVocabularyReady() {
+            log("⚡ CTC models already cached, skipping download")
+            sendResponse(ProgressResponse(progress: 1.0, phase: "ctc models ready"), encoder: encoder)
+            writeProtocolBytes(ctcModelsOkLine)
+            debugLog("───────────────────────────────────────────────────────")
+            return
+        }
 
         do {
             sendResponse(ProgressResponse(progress: 0.0, phase: "downloading ctc models"), encoder: encoder)
@@ -539,8 +703,9 @@ struct ParakeetSidecar {
             cachedCtcModels = nil
             cachedCtcTokenizer = nil
             cachedCtcSpotter = nil
+            cachedVocabularyContext = nil
             sendResponse(ProgressResponse(progress: 1.0, phase: "ctc models ready"), encoder: encoder)
-            sendResponse(OkResponse(command: "download_ctc_models"), encoder: encoder)
+            writeProtocolBytes(ctcModelsOkLine)
         } catch {
             log("❌ CTC MODEL DOWNLOAD FAILED")
             log("❌ Error type: \(type(of: error))")
@@ -549,7 +714,7 @@ struct ParakeetSidecar {
             sendError("ctc_model_download_failed", message: "Failed to download CTC models: \(error.localizedDescription)", encoder: encoder)
         }
 
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
     }
 
     static func rescoreTranscriptIfPossible(
@@ -561,12 +726,15 @@ struct ParakeetSidecar {
             return result.text
         }
 
-        guard ctcVocabularyReady() else {
+        // Once the CTC models and tokenizer are resident, the on-disk check
+        // has nothing left to tell us.
+        let ctcResident = cachedCtcModels != nil && cachedCtcTokenizer != nil
+        guard ctcResident || ctcVocabularyReady() else {
             log("ℹ️ Custom vocabulary skipped: CTC models not ready")
             return result.text
         }
 
-        let directory = CtcModels.defaultCacheDirectory(for: .ctc110m)
+        let directory = ctcModelDirectory
 
         guard let tokenTimings = result.tokenTimings, !tokenTimings.isEmpty else {
             log("ℹ️ Custom vocabulary skipped: token timings unavailable")
@@ -575,23 +743,11 @@ struct ParakeetSidecar {
 
         do {
             let tokenizer = try await cachedOrLoadCtcTokenizer(from: directory)
-            let terms = customVocabulary.compactMap { term -> CustomVocabularyTerm? in
-                let tokenIds = tokenizer.encode(term.text)
-                guard !tokenIds.isEmpty else { return nil }
-                return CustomVocabularyTerm(
-                    text: term.text,
-                    aliases: term.aliases.isEmpty ? nil : term.aliases,
-                    tokenIds: nil,
-                    ctcTokenIds: tokenIds
-                )
-            }
-
-            guard !terms.isEmpty else {
+            guard let vocabulary = cachedOrBuildVocabularyContext(for: customVocabulary, tokenizer: tokenizer) else {
                 log("ℹ️ Custom vocabulary skipped: no tokenizable terms")
                 return result.text
             }
 
-            let vocabulary = CustomVocabularyContext(terms: terms, minTermLength: 3)
             let models = try await cachedOrLoadCtcModels(from: directory)
             let spotter = cachedOrCreateCtcSpotter(models: models)
             let samples = try AudioConverter().resampleAudioFile(audioURL)
@@ -646,6 +802,34 @@ struct ParakeetSidecar {
         return tokenizer
     }
 
+    static func cachedOrBuildVocabularyContext(
+        for customVocabulary: [IncomingVocabularyTerm],
+        tokenizer: CtcTokenizer
+    ) -> CustomVocabularyContext? {
+        if let cached = cachedVocabularyContext, cached.terms == customVocabulary {
+            return cached.context
+        }
+
+        let terms = customVocabulary.compactMap { term -> CustomVocabularyTerm? in
+            let tokenIds = tokenizer.encode(term.text)
+            guard !tokenIds.isEmpty else { return nil }
+            return CustomVocabularyTerm(
+                text: term.text,
+                aliases: term.aliases.isEmpty ? nil : term.aliases,
+                tokenIds: nil,
+                ctcTokenIds: tokenIds
+            )
+        }
+
+        guard !terms.isEmpty else {
+            return nil
+        }
+
+        let context = CustomVocabularyContext(terms: terms, minTermLength: 3)
+        cachedVocabularyContext = (terms: customVocabulary, context: context)
+        return context
+    }
+
     static func cachedOrCreateCtcSpotter(models: CtcModels) -> CtcKeywordSpotter {
         if let spotter = cachedCtcSpotter {
             return spotter
@@ -657,9 +841,9 @@ struct ParakeetSidecar {
     }
 
     nonisolated static func diarizeFile(_ audioPath: String, encoder: JSONEncoder) async {
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("👥 DIARIZATION REQUEST")
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
         log("📄 Audio path: \(audioPath)")
 
         guard FileManager.default.fileExists(atPath: audioPath) else {
@@ -671,7 +855,7 @@ struct ParakeetSidecar {
         do {
             let manager = OfflineDiarizerManager()
             try await manager.prepareModels()
-            let result = try await manager.process(URL(fileURLWithPath: audioPath))
+            let result = try await manager.process(URL(fileURLWithPath: audioPath, isDirectory: false))
             let segments = result.segments.map { segment in
                 SpeakerSegment(
                     speakerId: segment.speakerId,
@@ -689,22 +873,31 @@ struct ParakeetSidecar {
             sendError("diarization_failed", message: "Diarization failed: \(error.localizedDescription)", encoder: encoder)
         }
 
-        log("───────────────────────────────────────────────────────")
+        debugLog("───────────────────────────────────────────────────────")
     }
 
     nonisolated static func sendResponse<T: Encodable>(_ response: T, encoder: JSONEncoder) {
         do {
-            let data = try encoder.encode(response)
-            if let jsonString = String(data: data, encoding: .utf8) {
-                writeProtocolLine(jsonString)
-            }
+            writeProtocolLine(try encoder.encode(response))
         } catch {
-            writeProtocolLine("{\"type\":\"error\",\"code\":\"serialization_error\",\"message\":\"Failed to serialize response\"}")
+            writeProtocolBytes(serializationErrorLine)
         }
     }
 
+    // Codes are fixed ASCII identifiers, so only the message needs encoding;
+    // the rest of the error object is spliced in around it.
     nonisolated static func sendError(_ code: String, message: String, encoder: JSONEncoder) {
-        sendResponse(ErrorResponse(code: code, message: message), encoder: encoder)
+        guard let encodedMessage = try? encoder.encode(message) else {
+            writeProtocolBytes(serializationErrorLine)
+            return
+        }
+
+        var line = Data(#"{"type":"error","code":""#.utf8)
+        line.append(contentsOf: code.utf8)
+        line.append(contentsOf: #"","message":"#.utf8)
+        line.append(encodedMessage)
+        line.append(contentsOf: [0x7D, 0x0A])
+        writeProtocolBytes(line)
     }
 
     nonisolated static func sendProgress(_ progress: DownloadUtils.DownloadProgress, encoder: JSONEncoder) {
@@ -718,42 +911,26 @@ struct ParakeetSidecar {
             phase = modelName.isEmpty ? "compiling" : "compiling \(modelName)"
         }
 
+        let fraction = max(0.0, min(1.0, progress.fractionCompleted))
+        let key = ProgressKey(percent: Int((fraction * 100).rounded()), phase: phase)
+        let isRepeat = lastSentProgress.withLock { (last: inout ProgressKey?) -> Bool in
+            if last == key {
+                return true
+            }
+            last = key
+            return false
+        }
+        guard !isRepeat else {
+            return
+        }
+
         sendResponse(
             ProgressResponse(
-                progress: max(0.0, min(1.0, progress.fractionCompleted)),
+                progress: fraction,
                 phase: phase
             ),
             encoder: encoder
         )
     }
-
-
-    static func decodeCustomVocabulary(from data: Data) -> [IncomingVocabularyTerm] {
-        struct TranscribeCommand: Decodable {
-            let custom_vocabulary: [IncomingVocabularyTerm]?
-        }
-
-        do {
-            return try JSONDecoder().decode(TranscribeCommand.self, from: data).custom_vocabulary ?? []
-        } catch {
-            log("⚠️ Custom vocabulary ignored: command vocabulary payload could not be decoded")
-            return []
-        }
-    }
-
-    static func parseModelVersion(_ value: Any?) -> SupportedModelVersion? {
-        guard let str = (value as? String)?.lowercased() else {
-            return nil
-        }
-
-        switch str {
-        case "v2":
-            return .v2
-        case "v3":
-            return .v3
-        default:
-            return nil
-        }
-    }
 }
 
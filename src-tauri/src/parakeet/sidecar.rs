@@ -6,13 +6,13 @@ use log::{debug, error, warn};
 use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::Arc;
 use std::time::Duration;
-use tauri::async_runtime::{Receiver, RwLock};
+use tauri::async_runtime::Receiver;
 use tauri::AppHandle;
 use tauri_plugin_shell::{
     process::{CommandChild, CommandEvent},
     ShellExt,
 };
-use tokio::sync::RwLockWriteGuard;
+use tokio::sync::{Mutex, MutexGuard};
 
 fn extract_json_payload(raw: &str) -> Option<&str> {
     let start = raw.find('{')?;
@@ -275,22 +275,22 @@ impl ParakeetSidecar {
 
 pub struct ParakeetClient {
     binary_name: String,
-    inner: RwLock<Option<ParakeetSidecar>>,
+    inner: Mutex<Option<ParakeetSidecar>>,
 }
 
 impl ParakeetClient {
     pub fn new(binary_name: impl Into<String>) -> Self {
         Self {
             binary_name: binary_name.into(),
-            inner: RwLock::new(None),
+            inner: Mutex::new(None),
         }
     }
 
     async fn ensure(
         &self,
         app: &AppHandle,
-    ) -> Result<RwLockWriteGuard<'_, Option<ParakeetSidecar>>, ParakeetError> {
-        let mut guard = self.inner.write().await;
+    ) -> Result<MutexGuard<'_, Option<ParakeetSidecar>>, ParakeetError> {
+        let mut guard = self.inner.lock().await;
         if guard.is_none() {
             let sidecar = ParakeetSidecar::spawn(app, &self.binary_name).await?;
             guard.replace(sidecar);
@@ -298,7 +298,7 @@ impl ParakeetClient {
         Ok(guard)
     }
 
-    fn clear_sidecar(guard: &mut RwLockWriteGuard<'_, Option<ParakeetSidecar>>) {
+    fn clear_sidecar(guard: &mut MutexGuard<'_, Option<ParakeetSidecar>>) {
         if let Some(sidecar) = guard.take() {
             sidecar.kill();
         }
@@ -392,7 +392,7 @@ impl ParakeetClient {
             _ => false,
         };
         if clear_after {
-            let mut guard = self.inner.write().await;
+            let mut guard = self.inner.lock().await;
             Self::clear_sidecar(&mut guard);
         }
 
@@ -400,7 +400,7 @@ impl ParakeetClient {
     }
 
     pub async fn shutdown(&self) {
-        if let Some(sidecar) = self.inner.write().await.take() {
+        if let Some(sidecar) = self.inner.lock().await.take() {
             sidecar.kill();
         }
     }
@@ -632,6 +632,27 @@ mod tests {
         }
     }
 
+    #[test]
+    fn parse_response_line_defaults_missing_transcription_segments() {
+        // The Swift sidecar omits `segments`; it has no per-segment timings.
+        let raw = r#"{"type":"transcription","text":"Hello world","language":"en","duration":1.0}"#;
+        let response = parse_response_line(raw).expect("expected valid transcription response");
+        match response {
+            ParakeetResponse::Transcription {
+                text,
+                segments,
+                language,
+                duration,
+            } => {
+                assert_eq!(text, "Hello world");
+                assert!(segments.is_empty());
+                assert_eq!(language.as_deref(), Some("en"));
+                assert!((duration.unwrap() - 1.0_f32).abs() < 1e-4);
+            }
+            other => panic!("unexpected response: {:?}", other),
+        }
+    }
+
     #[test]
     fn parse_response_line_rejects_banner_line() {
         let err = parse_response_line("🔄 LOAD MODEL REQUEST")